@@ -0,0 +1,103 @@
+"""
+tuna_repo.py – one shared, cached clone of TUNA for all config finders
+
+The nginx, postgres and redis finders all read CSVs out of TUNA (or a fork
+of it).  Instead of each finder cloning its own copy, ``ensure`` keeps a
+single partial bare clone per repository URL under ``CACHE_ROOT`` and
+exposes each branch as a git worktree:
+
+    ~/.cache/tuna/<hash(url)>/repo.git        bare clone (--filter=blob:none)
+    ~/.cache/tuna/<hash(url)>/<branch>/       worktree for <branch>
+
+Worktrees are sparse when ``subdir`` is given, so only the blobs a finder
+actually reads are downloaded; later calls for other subdirectories widen
+the sparse checkout instead of cloning again.  A ``.clone_stamp`` is written
+after each step succeeds, and anything without a matching stamp (e.g. an
+interrupted clone) is wiped and recreated rather than silently reused.
+"""
+
+import fcntl
+import hashlib
+import logging
+import os
+import pathlib
+import shutil
+import subprocess
+from typing import Optional
+
+CACHE_ROOT = pathlib.Path(
+    os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache")
+) / "tuna"
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _stamped(path: pathlib.Path, expected: str) -> bool:
+    stamp = path / ".clone_stamp"
+    return path.exists() and stamp.exists() and stamp.read_text() == expected
+
+
+def _bare_clone(url: str, bare: pathlib.Path) -> pathlib.Path:
+    """Partial bare clone of ``url`` (tips of all branches, no blobs yet)."""
+    expected = f"{url}\n"
+    if _stamped(bare, expected):
+        return bare
+    shutil.rmtree(bare.parent, ignore_errors=True)
+    bare.parent.mkdir(parents=True, exist_ok=True)
+    logging.info("Cloning %s into %s", url, bare)
+    _git("clone", "--bare", "--filter=blob:none", "--depth=1", "--no-single-branch", url, str(bare))
+    (bare / ".clone_stamp").write_text(expected)
+    return bare
+
+
+def _default_branch(bare: pathlib.Path) -> str:
+    """Name of the branch ``HEAD`` points at, read in-process when possible."""
+    head = (bare / "HEAD").read_text().strip()
+    if head.startswith("ref: refs/heads/"):
+        return head[len("ref: refs/heads/"):]
+    return _git("-C", str(bare), "symbolic-ref", "--short", "HEAD")
+
+
+def ensure(url: str, branch: Optional[str] = None, subdir: Optional[str] = None) -> pathlib.Path:
+    """Return a worktree of ``branch`` of ``url`` (default branch if None).
+
+    If ``subdir`` is given the worktree is a cone-mode sparse checkout that
+    is guaranteed to contain ``subdir``; otherwise the full tree is checked
+    out (an existing sparse worktree is widened to the full tree).  Calls
+    for the same ``url`` are serialised with a file lock, so finders may run
+    concurrently (threads or processes); the warm path is a few stat/read
+    calls and spawns no ``git`` process.
+    """
+    key = hashlib.blake2b(url.encode()).hexdigest()[:16]
+    CACHE_ROOT.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_ROOT / f"{key}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        bare = _bare_clone(url, CACHE_ROOT / key / "repo.git")
+        branch = branch or _default_branch(bare)
+        wt = bare.parent / branch.replace("/", "_")
+
+        # the stamp records the checkout mode: a full tree satisfies any call,
+        # a sparse one is widened (or made full) on demand
+        stamp = f"{url}\n{branch}\n"
+        if _stamped(wt, stamp + "full\n"):
+            return wt
+        if _stamped(wt, stamp + "sparse\n"):
+            if subdir is None:
+                _git("-C", str(wt), "sparse-checkout", "disable")
+                (wt / ".clone_stamp").write_text(stamp + "full\n")
+            elif not (wt / subdir).exists():
+                _git("-C", str(wt), "sparse-checkout", "add", subdir)
+            return wt
+
+        expected = stamp + ("sparse\n" if subdir else "full\n")
+        shutil.rmtree(wt, ignore_errors=True)
+        _git("-C", str(bare), "worktree", "prune")
+        logging.info("Checking out %s of %s into %s", branch, url, wt)
+        _git("-C", str(bare), "worktree", "add", "--no-checkout", str(wt), branch)
+        if subdir:
+            _git("-C", str(wt), "sparse-checkout", "set", "--cone", subdir)
+        _git("-C", str(wt), "checkout", branch)
+        (wt / ".clone_stamp").write_text(expected)
+        return wt
@@ -3,32 +3,58 @@
 best_ng_cfg.py – find the best Nginx configuration across TUNA_run*.csv
 
 Logic
-1.  clone (or reuse) the TUNA repo
+1.  clone (or reuse) the TUNA repo via the shared common/tuna_repo cache
 2.  for every TUNA_run*.csv in sample_configs/azure/nginx/wikipedia/
       • skip the first 10 rows
       • keep rows where Worker ≥ 9          (high-fidelity subset)
-3.  concatenate all qualifying rows
+      • stream the rows, keeping only the best-Performance one
+3.  collect the per-file winners
 4.  pick the row with the highest Performance
 5.  save its Config as TUNA_best_nginx_config.json
 """
 
+import csv
+import hashlib
 import json
+import os
 import pathlib
-import subprocess
 import sys
-import tempfile
-from typing import Iterable
+from typing import Iterable, List, NamedTuple, Optional
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
-import pandas as pd
+# Shared TUNA clone cache (pcbench/common/tuna_repo.py)
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from common import tuna_repo  # noqa: E402
 
 # You can change these constants if you wish to target a different
 # repository or workload.  The default values correspond to the Azure
 # wikipedia nginx workload from TUNA.
 REPO_URL = "https://github.com/uw-mad-dash/TUNA"
-CSV_GLOB = "sample_configs/azure/nginx/wikipedia/TUNA_run*.csv"
+CSV_DIR = "sample_configs/azure/nginx/wikipedia"
+CSV_GLOB = f"{CSV_DIR}/TUNA_run*.csv"
 OUT_FILE = "TUNA_best_nginx_config.json"
-TMPDIR = pathlib.Path(tempfile.gettempdir()) / "TUNA"
+CACHE_DIR = tuna_repo.CACHE_ROOT / "parsed" / "nginx"  # parsed per-file winners, as JSON
+# Part of every cache key; bump it whenever Candidate's fields change so
+# entries written by an older version are re-parsed instead of misread.
+_CACHE_VERSION = 1
+
+# Only these columns are used downstream; converting the rest of the TUNA
+# CSV (dozens of knob columns) is wasted work.
+USECOLS = ["Worker", "Performance", "Config"]
+
+# Config strings are dicts with single quotes; swap them for JSON parsing.
+_QUOTE_TRANS = str.maketrans({"'": '"'})
+
+
+class Candidate(NamedTuple):
+    """Best high-fidelity row of one TUNA CSV."""
+    performance: float
+    config: str
+    worker: int
+    source: str
+    rows: int = 0  # high-fidelity rows considered in ``source``
+
 
 # Configure logging
 logging.basicConfig(
@@ -37,80 +63,157 @@ logging.basicConfig(
 )
 
 
-def clone_if_needed(url: str, dest: pathlib.Path) -> pathlib.Path:
-    """Clone the repository at ``url`` into ``dest`` if it doesn't exist."""
-    if dest.exists():
-        return dest
-    subprocess.run(["git", "clone", "--depth=1", url, str(dest)], check=True)
-    return dest
-
+def load_candidates(csv_path: pathlib.Path) -> Optional[Candidate]:
+    """Stream a CSV file and return its best high-fidelity row.
 
-def load_candidates(csv_path: pathlib.Path) -> pd.DataFrame:
-    """Load a CSV file and return only high-fidelity rows.
-
-    We skip the first 10 header rows (matching TUNA's convention) and
-    then keep only those rows whose ``Worker`` field equals the
-    maximum ``Worker`` value observed in the file.  These rows
-    represent the highest fidelity tuning runs for that CSV.
+    We skip the first 10 rows after the header (matching TUNA's
+    convention) and then consider only those rows whose ``Worker``
+    field is at least 9.  These rows represent the highest fidelity
+    tuning runs for that CSV.  Of those, only the row with the highest
+    ``Performance`` is kept, since no other row can be the global best;
+    it is returned as a :class:`Candidate`, or ``None`` if the file has
+    no usable rows.  Only the three fields we need are converted per row.
     """
-    logging.info("Reading %s", csv_path)
+    logging.debug("Reading %s", csv_path)
     try:
-        df = pd.read_csv(csv_path, skiprows=range(1, 11))
+        with open(csv_path, newline="") as fh:
+            header = next(csv.reader([fh.readline()]))
+            # The 10 rows after the header are skipped as raw lines, so the
+            # csv tokenizer never sees them.
+            for _ in range(10):
+                fh.readline()
+            try:
+                wi, pi, ci = (header.index(c) for c in USECOLS)
+            except ValueError:
+                print(f"[WARN] missing Worker/Performance/Config columns in {csv_path}; skipped.", file=sys.stderr)
+                return None
+
+            best = None
+            rows = 0
+            for row in csv.reader(fh):
+                try:
+                    worker = float(row[wi])
+                    if not 9 <= worker < float("inf"):  # also skips NaN/inf Worker
+                        continue
+                    perf = float(row[pi])
+                except (ValueError, IndexError):
+                    continue
+                rows += 1
+                if perf == perf and (best is None or perf > best.performance):  # skip NaN
+                    best = Candidate(perf, row[ci], int(worker), str(csv_path))
     except Exception as exc:
         print(f"[WARN] cannot read {csv_path}: {exc}", file=sys.stderr)
-        return pd.DataFrame()
-
-    if "Worker" not in df.columns or "Performance" not in df.columns:
-        print(f"[WARN] missing Worker/Performance columns in {csv_path}; skipped.", file=sys.stderr)
-        return pd.DataFrame()
-
-    # Determine the maximum Worker value in this run and filter down to rows
-    # with that Worker count.  This mirrors the idea of using the most
-    # complete fidelity from the tuning process.
-    max_worker = df["Worker"].max()
-    high_fidelity = df[df["Worker"] >= 9].copy()
-    high_fidelity["__source"] = str(csv_path)
-
-    # Per-file best performance logging
-    if not high_fidelity.empty:
-        best_perf = high_fidelity["Performance"].max()
-        logging.info("Best Performance in %s: %s (rows considered: %d)", csv_path.name, best_perf, len(high_fidelity))
-    else:
-        logging.info("No high-fidelity rows (Worker ≥ 9) in %s", csv_path.name)
+        return None
+
+    # Per-file details are DEBUG only; main() logs one aggregated summary.
+    if best is None:
+        logging.debug("No high-fidelity rows (Worker ≥ 9) in %s", csv_path.name)
+        return None
+    logging.debug("Best Performance in %s: %s (rows considered: %d)",
+                  csv_path.name, best.performance, rows)
+    return best._replace(rows=rows)
+
+
+def _cache_path(csv_path: pathlib.Path) -> pathlib.Path:
+    st = csv_path.stat()
+    key = f"{_CACHE_VERSION}:{csv_path}:{st.st_mtime_ns}:{st.st_size}"
+    return CACHE_DIR / f"{hashlib.blake2b(key.encode()).hexdigest()[:16]}.json"
+
+
+def read_cached(csv_path: pathlib.Path) -> Optional[Candidate]:
+    """Cached result for ``csv_path``, or None on a cache miss."""
+    cached = _cache_path(csv_path)
+    if cached.exists():
+        try:
+            return Candidate(*json.loads(cached.read_text()))
+        except Exception as exc:
+            logging.warning("Ignoring unreadable cache %s: %s", cached, exc)
+    return None
+
+
+def parse_and_cache(csv_path: pathlib.Path) -> Optional[Candidate]:
+    """Run :func:`load_candidates` and store a non-empty result in the cache."""
+    best = load_candidates(csv_path)
+    if best is not None:
+        cached = _cache_path(csv_path)
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(list(best)))
+        os.replace(tmp, cached)
+    return best
+
+
+def load_candidates_cached(csv_path: pathlib.Path) -> Optional[Candidate]:
+    """Like :func:`load_candidates`, but memoised on disk as JSON.
+
+    The cache key covers the CSV's path, mtime and size, so an updated
+    clone is re-parsed while unchanged files are read straight from
+    ``CACHE_DIR``.  Empty results (unreadable files, no high-fidelity
+    rows) are not cached.
+    """
+    best = read_cached(csv_path)
+    return best if best is not None else parse_and_cache(csv_path)
+
 
-    return high_fidelity
+def prune_cache(csv_files: Iterable[pathlib.Path]) -> None:
+    """Delete cached results that no longer match any of ``csv_files``.
+
+    Every re-clone or format bump orphans the old entries, so without this
+    ``CACHE_DIR`` would grow on each run that re-parses.
+    """
+    keep = {_cache_path(p) for p in csv_files}
+    for f in CACHE_DIR.glob("*.json"):
+        if f not in keep:
+            f.unlink(missing_ok=True)
 
 
-def gather_all_rows(csv_files: Iterable[pathlib.Path]) -> pd.DataFrame:
-    """Concatenate candidate rows from multiple CSV files."""
-    dfs = [load_candidates(f) for f in csv_files]
-    if not dfs:
-        return pd.DataFrame()
-    return pd.concat(dfs, ignore_index=True)
+def gather_candidates(csv_files: Iterable[pathlib.Path]) -> List[Candidate]:
+    """Collect the best row from each of multiple CSV files.
+
+    Cached results are read in this process; only the cache misses are
+    parsed, in parallel worker processes (parsing is CPU-bound).  A warm
+    cache, or a single miss, never starts a pool.  Each worker only ships
+    back a small tuple, keeping the pickling overhead negligible.
+    """
+    csv_files = list(csv_files)
+    results = [read_cached(p) for p in csv_files]
+    misses = [i for i, c in enumerate(results) if c is None]
+    if len(misses) > 1:
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(misses))) as ex:
+            for i, c in zip(misses, ex.map(parse_and_cache, [csv_files[i] for i in misses])):
+                results[i] = c
+    else:
+        for i in misses:
+            results[i] = parse_and_cache(csv_files[i])
+    return [c for c in results if c is not None]
 
 
 def main() -> None:
-    repo_dir = clone_if_needed(REPO_URL, TMPDIR)
+    repo_dir = tuna_repo.ensure(REPO_URL, subdir=CSV_DIR)
     csv_files = sorted(repo_dir.glob(CSV_GLOB))
     if not csv_files:
         sys.exit("✗ No TUNA_run*.csv files found under the expected path!")
 
-    all_rows = gather_all_rows(csv_files)
-    if all_rows.empty:
+    candidates = gather_candidates(csv_files)
+    prune_cache(csv_files)
+    if not candidates:
         sys.exit("✗ No high-fidelity rows found in any CSV file.")
 
     # Choose the row with the maximum Performance value across all
     # high-fidelity rows.
-    best_row = all_rows.loc[all_rows["Performance"].idxmax()]
+    best_row = max(candidates, key=lambda c: c.performance)
+    logging.info("Parsed %d files (%d with high-fidelity rows), total rows=%d, top=%s",
+                 len(csv_files), len(candidates), sum(c.rows for c in candidates),
+                 best_row.performance)
 
     # Parse the Config column (stringified dict using single quotes) into a
     # Python dict.  The Config column often contains single quotes so we
     # replace them with double quotes before calling json.loads.
     try:
-        cfg_dict = json.loads(best_row["Config"].replace("'", '"'))
+        cfg_dict = json.loads(best_row.config.translate(_QUOTE_TRANS))
     except json.JSONDecodeError:
         print("[ERROR] Failed to parse the Config field; dumping raw string instead.", file=sys.stderr)
-        cfg_dict = {"raw_config": best_row["Config"]}
+        cfg_dict = {"raw_config": best_row.config}
 
     # Write the best configuration to disk as pretty-printed JSON.
     with open(OUT_FILE, "w") as fh:
@@ -118,14 +221,14 @@ def main() -> None:
 
     # Report summary to the console.
     print("🏆 Best nginx configuration written to", OUT_FILE)
-    print("   Worker      :", best_row["Worker"])
-    print("   Performance :", best_row["Performance"])
+    print("   Worker      :", best_row.worker)
+    print("   Performance :", best_row.performance)
     # Show the file name relative to the repo for context.
     try:
-        rel = pathlib.Path(best_row["__source"]).relative_to(repo_dir)
+        rel = pathlib.Path(best_row.source).relative_to(repo_dir)
         print("   Source CSV  :", rel)
     except Exception:
-        print("   Source CSV  :", best_row["__source"])
+        print("   Source CSV  :", best_row.source)
 
 
 if __name__ == "__main__":
@@ -3,69 +3,140 @@
 best_pg_cfg.py        –  find the best Postgres configuration across TUNA_run*.csv
 
 Logic
-1.  clone (or reuse) the TUNA repo
+1.  clone (or reuse) the TUNA repo via the shared common/tuna_repo cache
 2.  for every TUNA_run*.csv in sample_configs/cloudlab/postgres/tpcc/
       • skip the first 10 rows
       • keep rows where Worker >= 9          (max-fidelity subset)
-3.  concatenate all qualifying rows
+      • stream the rows, keeping only the best-Performance one
+3.  collect the per-file winners
 4.  pick the row with the highest Performance
 5.  save its Config as TUNA_best_pgsql_config.json
 """
 
-import json, pathlib, subprocess, sys, tempfile
-import pandas as pd
+import csv, hashlib, json, os, pathlib, sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, NamedTuple, Optional
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))  # pcbench/
+from common import tuna_repo                                              # shared TUNA clone
 
 REPO_URL  = "https://github.com/uw-mad-dash/TUNA"
-CSV_GLOB  = "sample_configs/cloudlab/postgres/tpcc/TUNA_run*.csv"
+CSV_DIR   = "sample_configs/cloudlab/postgres/tpcc"
+CSV_GLOB  = f"{CSV_DIR}/TUNA_run*.csv"
 OUT_FILE  = "TUNA_best_pgsql_config.json"
-TMPDIR    = pathlib.Path(tempfile.gettempdir()) / "TUNA"
+CACHE_DIR = tuna_repo.CACHE_ROOT / "parsed" / "postgres"  # JSON per-file winners
+_CACHE_VERSION = 1                                        # bump when Candidate changes
+USECOLS   = ["Worker", "Performance", "Config"]          # only columns we use
+_QUOTE_TRANS = str.maketrans({"'": '"'})                  # single → double quotes
+
+class Candidate(NamedTuple):                             # best row of one CSV
+    performance: float
+    config:      str
+    worker:      int
+    source:      str
 
 # --------------------------------------------------------------------------- #
-def clone_if_needed(url: str, dest: pathlib.Path) -> pathlib.Path:
-    if dest.exists():
-        return dest
-    subprocess.run(["git", "clone", "--depth=1", url, str(dest)], check=True)
-    return dest
-
-def load_candidates(csv_path: pathlib.Path) -> pd.DataFrame:
-    """Return rows with Worker >= 9 after skipping first 10 lines, else empty df."""
+def load_candidates(csv_path: pathlib.Path) -> Optional[Candidate]:
+    """Stream the CSV; return its best row with Worker >= 9 (after skipping 10), else None."""
+    best = None
     try:
-        df = pd.read_csv(csv_path, skiprows=range(1, 11))    # ➊ skip first 10
+        with open(csv_path, newline="") as fh:
+            header = next(csv.reader([fh.readline()]))
+            for _ in range(10):                               # ➊ skip first 10 as raw lines,
+                fh.readline()                                 #   never tokenised as CSV
+            try:
+                wi, pi, ci = (header.index(c) for c in USECOLS)
+            except ValueError:
+                print(f"[WARN] missing Worker/Performance/Config in {csv_path}; skipped.", file=sys.stderr)
+                return None
+            for row in csv.reader(fh):
+                try:                                          # ➋ only 3 fields are ever coerced
+                    worker = float(row[wi])
+                    perf   = float(row[pi]) if 9 <= worker < float("inf") else None  # NaN/inf: skip
+                except (ValueError, IndexError):
+                    continue
+                # ➌ streaming max: only the per-file best can win globally (NaN never wins)
+                if perf is not None and perf == perf and (best is None or perf > best.performance):
+                    best = Candidate(perf, row[ci], int(worker), str(csv_path))
     except Exception as e:
         print(f"[WARN] cannot read {csv_path}: {e}", file=sys.stderr)
-        return pd.DataFrame()
+        return None
+    return best
+
+def _cache_path(csv_path: pathlib.Path) -> pathlib.Path:
+    st  = csv_path.stat()
+    key = f"{_CACHE_VERSION}:{csv_path}:{st.st_mtime_ns}:{st.st_size}"
+    return CACHE_DIR / f"{hashlib.blake2b(key.encode()).hexdigest()[:16]}.json"
+
+def read_cached(csv_path: pathlib.Path) -> Optional[Candidate]:
+    """Cached load_candidates() result for csv_path, or None on a miss."""
+    cached = _cache_path(csv_path)
+    if cached.exists():
+        try:
+            return Candidate(*json.loads(cached.read_text()))
+        except Exception as e:
+            print(f"[WARN] ignoring unreadable cache {cached}: {e}", file=sys.stderr)
+    return None
+
+def parse_and_cache(csv_path: pathlib.Path) -> Optional[Candidate]:
+    """load_candidates(), storing a non-empty result as JSON."""
+    best = load_candidates(csv_path)
+    if best is not None:                                  # don't cache failures
+        cached = _cache_path(csv_path)
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(list(best)))
+        os.replace(tmp, cached)
+    return best
 
-    if "Worker" not in df.columns or "Performance" not in df.columns:
-        print(f"[WARN] missing Worker/Performance in {csv_path}; skipped.", file=sys.stderr)
-        return pd.DataFrame()
+def load_candidates_cached(csv_path: pathlib.Path) -> Optional[Candidate]:
+    """load_candidates() memoised as JSON, keyed by the CSV's path+mtime+size."""
+    best = read_cached(csv_path)
+    return best if best is not None else parse_and_cache(csv_path)
 
-    return df[df["Worker"] >= 9].assign(__source=str(csv_path))
+def prune_cache(csv_files: Iterable[pathlib.Path]) -> None:
+    """Drop cache entries that match none of csv_files (old clones, old formats)."""
+    keep = {_cache_path(p) for p in csv_files}
+    for f in CACHE_DIR.glob("*.json"):
+        if f not in keep:
+            f.unlink(missing_ok=True)
 
 # --------------------------------------------------------------------------- #
 def main() -> None:
-    repo_dir   = clone_if_needed(REPO_URL, TMPDIR)
+    repo_dir   = tuna_repo.ensure(REPO_URL, subdir=CSV_DIR)
     csv_files  = sorted(repo_dir.glob(CSV_GLOB))
     if not csv_files:
         sys.exit("✗ No TUNA_run*.csv files found!")
 
-    # gather all high-fidelity rows across every file
-    all_rows = pd.concat([load_candidates(f) for f in csv_files], ignore_index=True)
-    if all_rows.empty:
+    # gather the best high-fidelity row of every file: cache hits read here,
+    # misses parsed in a pool (≤ one process per core/miss; none for 0–1 misses)
+    results = [read_cached(p) for p in csv_files]
+    misses  = [i for i, c in enumerate(results) if c is None]
+    if len(misses) > 1:
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(misses))) as ex:
+            for i, c in zip(misses, ex.map(parse_and_cache, [csv_files[i] for i in misses])):
+                results[i] = c
+    else:
+        for i in misses:
+            results[i] = parse_and_cache(csv_files[i])
+    candidates = [c for c in results if c is not None]
+    prune_cache(csv_files)
+    if not candidates:
         sys.exit("✗ No configs were tested with Worker ≥ 9 in any CSV.")
 
     # choose the global best by Performance
-    best_row = all_rows.loc[all_rows["Performance"].idxmax()]
+    best_row = max(candidates, key=lambda c: c.performance)
 
     # Config column is a stringified dict using single quotes
-    cfg_dict = json.loads(best_row["Config"].replace("'", '"'))
+    cfg_dict = json.loads(best_row.config.translate(_QUOTE_TRANS))
 
     with open(OUT_FILE, "w") as fh:
         json.dump(cfg_dict, fh, indent=2, sort_keys=True)
 
     print("🏆 Best configuration written to", OUT_FILE)
-    print("   Worker        :", best_row["Worker"])
-    print("   Performance   :", best_row["Performance"])
-    print("   Source CSV    :", pathlib.Path(best_row["__source"]).relative_to(repo_dir))
+    print("   Worker        :", best_row.worker)
+    print("   Performance   :", best_row.performance)
+    print("   Source CSV    :", pathlib.Path(best_row.source).relative_to(repo_dir))
 
 # --------------------------------------------------------------------------- #
 if __name__ == "__main__":
@@ -17,149 +17,193 @@ Just run:
 import ast
 import json
 import logging
-import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
+import numpy as np
+import orjson
 import pandas as pd
+import polars as pl
 import re
 
+# Shared TUNA clone cache (pcbench/common/tuna_repo.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common import tuna_repo  # noqa: E402
+
 # Constants pointing to the TUNA repo and CSV location.
 REPO_URL = "https://github.com/ssmtariq/TUNA"
+BRANCH = "development"
 CSV_REL_PATH = Path("src/results_redis/full_seed1.csv")
-# Use a temporary directory under the system temp area for the clone
-TMPDIR = Path(tempfile.gettempdir()) / "TUNA_ssmtariq"
 CSV = None  # Path to full_seed1.csv; if None, clone TUNA and use src/results_redis/full_seed1.csv
 MIN_BUDGET = 0  # kept for compatibility (unused by max-budget selection logic)
 GOAL = "max"  # maximize or minimize Reported Value (kept for compatibility; we maximize)
 OUT_JSON = "TUNA_best_redis_config.json"
 OUT_CONF = "TUNA_best_redis_config.conf"
-
-
-def clone_if_needed(url: str, dest: Path) -> Path:
-    """Clone the repository at ``url`` into ``dest`` if it doesn't exist."""
-    if dest.exists():
-        return dest
-    logging.info("Cloning %s into %s", url, dest)
-    # Clone only the development branch to reduce download size
-    subprocess.run(
-        ["git", "clone", "--depth", "1", "--branch", "development", url, str(dest)],
-        check=True,
-    )
-    return dest
+# How many top-|Reported Value| rows to try before falling back to a full sort
+PICK_FAST_K = 32
+# Columns of full_seed1.csv that are actually used
+NEED_COLS = ["CleanConfig", "Budget", "Reported Value"]
 
 
 def load_csv(path: Path) -> pd.DataFrame:
-    """Read a CSV and validate required columns."""
+    """Read a CSV, validate required columns and keep only max-Budget rows.
+
+    The CSV is scanned lazily with polars so the Budget filter and column
+    projection are pushed down into the (multithreaded) reader; only the
+    surviving rows are materialized and handed to pandas.
+    """
     try:
-        df = pd.read_csv(path)
-    except Exception:
-        # fallback to python engine if quoting is funky
+        # Reported Value stays float64 so the printed winner is the CSV's value
+        lf = pl.scan_csv(path, schema_overrides={"Reported Value": pl.Float64})
+        missing = set(NEED_COLS).difference(lf.collect_schema().names())
+        if missing:
+            sys.exit(f"✗ Missing columns {missing} in {path}")
+        # Trace budgets present (diagnostic only, so skipped at INFO level)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            budgets = lf.select(pl.col("Budget").unique().sort()).collect().to_series().to_numpy()
+            logging.debug("Budgets present: %s", budgets)
+        max_budget = lf.select(pl.col("Budget").max()).collect().item()
+        if max_budget is None:
+            return pd.DataFrame(columns=NEED_COLS)
+        return lf.filter(pl.col("Budget") == max_budget).select(NEED_COLS).collect().to_pandas()
+    except pl.exceptions.PolarsError:
+        # fallback to pandas' python engine if quoting is funky
         df = pd.read_csv(path, engine="python")
-    need = {"CleanConfig", "Budget", "Reported Value"}
-    missing = need.difference(df.columns)
+    missing = set(NEED_COLS).difference(df.columns)
     if missing:
         sys.exit(f"✗ Missing columns {missing} in {path}")
-    # strip an auto-generated index column if present
-    if "Unnamed: 0" in df.columns:
-        df = df.drop(columns=["Unnamed: 0"])
-    return df
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Budgets present: %s", np.unique(df["Budget"].to_numpy()))
+    return df.loc[df["Budget"] == df["Budget"].max(), NEED_COLS]
 
 
 def pick_best(df: pd.DataFrame) -> pd.Series:
     """
-    Choose rows evaluated at the **maximum Budget**, then select the one with the
+    Choose rows evaluated at the **maximum Budget** (``load_csv`` has usually
+    already reduced ``df`` to those), then select the one with the
     largest absolute Reported Value. Add tracing to show what's considered and why.
     """
     if df.empty:
         sys.exit("✗ No rows in CSV.")
 
-    # Trace budgets present
-    budgets = sorted(pd.unique(df["Budget"]))
-    logging.info("Budgets present: %s", budgets)
-
     max_budget = df["Budget"].max()
-    candidates = df[df["Budget"] == max_budget].copy()
+    candidates = df[df["Budget"] == max_budget]
     logging.info("Max budget=%s; candidate rows=%d", max_budget, len(candidates))
 
     if candidates.empty:
         sys.exit("✗ No rows at maximum Budget.")
 
-    # Ensure numeric (just in case CSV has strings)
-    candidates["__rv"] = pd.to_numeric(candidates["Reported Value"], errors="coerce")
+    # Ensure numeric (just in case CSV has strings); work on raw NumPy arrays
+    # from here on and address rows by position.
+    rv = pd.to_numeric(candidates["Reported Value"], errors="coerce").to_numpy(dtype=np.float64)
+    abs_rv = np.abs(rv)
+    cfgs = candidates["CleanConfig"].to_numpy()
 
     # Show a quick snapshot of Reported Values at this budget
-    logging.info("Reported Value (first 10, raw) at max budget: %s",
-                 candidates["__rv"].head(10).tolist())
-    logging.info("Reported Value (first 10, abs) at max budget: %s",
-                 candidates["__rv"].abs().head(10).tolist())
-
-    # Order by descending absolute reported value
-    order = candidates["__rv"].abs().sort_values(ascending=False).index
+    logging.info("Reported Value (first 10, raw) at max budget: %s", rv[:10].tolist())
+    logging.info("Reported Value (first 10, abs) at max budget: %s", abs_rv[:10].tolist())
+
+    # Order by descending absolute reported value (NaN last).  The top row
+    # almost always parses, so partially select the best PICK_FAST_K and only
+    # pay for a full sort if all of those fail.  The partition runs on a
+    # float32 copy; rounding is monotone, so keeping every row at or above
+    # the k-th float32 value keeps the exact top k, which are then ordered
+    # by the float64 values.
+    neg_abs = -abs_rv
+
+    def ranked():
+        k = min(PICK_FAST_K, len(neg_abs))
+        neg32 = neg_abs.astype(np.float32)
+        kth = np.partition(neg32, k - 1)[k - 1]
+        top = np.flatnonzero(neg32 <= kth) if not np.isnan(kth) else np.arange(len(neg32))
+        top = top[np.argsort(neg_abs[top], kind="stable")]
+        yield from top
+        tried = set(top.tolist())
+        yield from (pos for pos in np.argsort(neg_abs, kind="stable") if pos not in tried)
 
     # Walk candidates by |Reported Value| and pick first whose CleanConfig parses
-    for rank, idx in enumerate(order, 1):
-        rv = candidates.at[idx, "__rv"]
-        cfg = candidates.at[idx, "CleanConfig"]
+    for rank, pos in enumerate(ranked(), 1):
+        idx = candidates.index[pos]
         try:
             # Use the existing sanitizer (handles np.str_(...), int(...), etc.)
-            _ = sanitize_config_str(cfg)
+            _ = sanitize_config_str(cfgs[pos])
             logging.info(
                 "Pick rank %d: idx=%s rv=%s abs=%s (parsable=YES)",
-                rank, idx, rv, (abs(rv) if pd.notna(rv) else None)
+                rank, idx, rv[pos], (None if np.isnan(rv[pos]) else abs_rv[pos])
             )
-            return candidates.loc[idx]
+            return candidates.iloc[pos]
         except Exception as e:
             logging.info(
                 "Skip rank %d: idx=%s rv=%s abs=%s (parsable=NO: %s)",
-                rank, idx, rv, (abs(rv) if pd.notna(rv) else None), e
+                rank, idx, rv[pos], (None if np.isnan(rv[pos]) else abs_rv[pos]), e
             )
             continue
 
 
     # Fallback: if none parse, still return the largest-|rv| row
-    idx = candidates["__rv"].abs().idxmax()
-    rv = candidates.at[idx, "__rv"]
+    pos = int(np.argsort(neg_abs, kind="stable")[0])
     logging.info("Fallback pick idx=%s rv=%s abs=%s (no parsable CleanConfig found)",
-                 idx, rv, (abs(rv) if pd.notna(rv) else None))
-    return candidates.loc[idx]
+                 candidates.index[pos], rv[pos], (None if np.isnan(rv[pos]) else abs_rv[pos]))
+    return candidates.iloc[pos]
 
 
-# Precompile once at module import
-_NP_STR_RE = re.compile(r"np\.str_\((['\"])(.*?)\1\)")
+# Precompile once at module import.  Matches np.str_('foo') and np.str_("foo");
+# the content lands in group 2 or 3 so one '\2\3' substitution handles both.
+_NP_STR_RE = re.compile(r"np\.str_\(('([^']*)'|\"([^\"]*)\")\)")
+# Python → JSON normalisation for the orjson fast path.  Quoted strings are
+# matched (and kept) first so only bare True/False/None tokens are rewritten.
+_QUOTE_TRANS = str.maketrans({"'": '"'})
+_PY_CONST_RE = re.compile(r'"[^"]*"|\b(True|False|None)\b')
+_PY_TO_JSON = {"True": "true", "False": "false", "None": "null"}
+
+
+def _to_json_const(m: re.Match) -> str:
+    return _PY_TO_JSON[m.group(1)] if m.group(1) else m.group(0)
+
 
 def sanitize_config_str(s: str) -> dict:
     # 1) Normalize: convert np.str_('foo') → 'foo'
-    s_norm = _NP_STR_RE.sub(r"'\2'", s)
+    s_norm = _NP_STR_RE.sub(r"'\2\3'", s)
 
-    # 2) Try strict safe parsing first
+    # 2) Fast path: most CleanConfig strings are plain str/number/bool dicts,
+    #    which orjson parses in C once quotes and constants are JSON-ified.
+    #    Swapping ' for " only preserves the meaning when no string holds a
+    #    '"' or an escape, so anything else goes straight to ast.
+    if '"' not in s_norm and "\\" not in s_norm:
+        try:
+            d = orjson.loads(_PY_CONST_RE.sub(_to_json_const, s_norm.translate(_QUOTE_TRANS)))
+            return {str(k).strip(): v for k, v in d.items()}
+        except orjson.JSONDecodeError:
+            pass
+
+    # 3) Try strict safe parsing next
     try:
         d = ast.literal_eval(s_norm)
         return {str(k).strip(): v for k, v in d.items()}
     except Exception:
-        # 3) Very restricted fallback (only simple constructors)
+        # 4) Very restricted fallback (only simple constructors)
         safe_funcs = {"int": int, "float": float, "str": str, "bool": bool}
         d = eval(s_norm, {"__builtins__": {}}, safe_funcs)
         return {str(k).strip(): v for k, v in d.items()}
 
 
 def write_json(d: dict, out_json: Path):
-    with open(out_json, "w") as fh:
-        json.dump(d, fh, indent=2, sort_keys=True)
+    try:
+        data = orjson.dumps(d, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # stdlib fallback for types orjson doesn't encode natively
+        data = json.dumps(d, indent=2, sort_keys=True, default=str).encode()
+    out_json.write_bytes(data)
     print("✓ wrote", out_json)
 
 
 def write_redis_conf(d: dict, out_conf: Path):
-    lines = []
-    for k, v in d.items():
-        # Booleans in redis.conf are yes/no; but in our CSV they’re often already "yes"/"no"
-        if isinstance(v, bool):
-            val = "yes" if v else "no"
-        else:
-            val = str(v)
-        lines.append(f"{k} {val}")
-    out_conf.write_text("\n".join(lines) + "\n")
+    # Booleans in redis.conf are yes/no; but in our CSV they’re often already "yes"/"no"
+    text = "\n".join(
+        f"{k} {'yes' if v else 'no'}" if isinstance(v, bool) else f"{k} {v}"
+        for k, v in d.items()
+    ) + "\n"
+    out_conf.write_bytes(text.encode("utf-8"))
     print("✓ wrote", out_conf)
 
 
@@ -173,14 +217,13 @@ def main() -> None:
         csv_path = Path(CSV)
         repo_dir = None
     else:
-        repo_dir = clone_if_needed(REPO_URL, TMPDIR)
+        repo_dir = tuna_repo.ensure(REPO_URL, BRANCH)
         csv_path = repo_dir / CSV_REL_PATH
         if not csv_path.exists():
-            # try to find the CSV somewhere under the repository
-            matches = list(repo_dir.rglob("full_seed1.csv"))
-            if not matches:
+            # try to find the CSV somewhere under the repository (first hit wins)
+            csv_path = next(repo_dir.rglob("full_seed1.csv"), None)
+            if csv_path is None:
                 sys.exit("✗ No full_seed1.csv found in the cloned TUNA repository")
-            csv_path = matches[0]
 
     logging.info("Reading tuning results from %s", csv_path)
     df = load_csv(csv_path)
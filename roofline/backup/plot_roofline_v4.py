@@ -2,11 +2,6 @@
 # -*- coding: utf-8 -*-
 import csv, math, sys
 from pathlib import Path
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-
-# --- Fonts: Times New Roman everywhere (kept minimal; no other styling changes) ---
-mpl.rcParams['font.family'] = 'Times New Roman'
 
 # ---------- helpers ----------
 def read_summary(csv_path):
@@ -34,6 +29,14 @@ def mid_before_knee(xs, knee):
 
 # ---------- main plot ----------
 def plot_roofline(csv_path, title=None, savepath=None):
+    import matplotlib as mpl
+    if savepath:
+        mpl.use('Agg', force=False)   # file output only: skip GUI toolkit init
+    import matplotlib.pyplot as plt
+
+    # --- Fonts: Times New Roman everywhere (kept minimal; no other styling changes) ---
+    mpl.rcParams['font.family'] = 'Times New Roman'
+
     d = read_summary(csv_path)
 
     # App point
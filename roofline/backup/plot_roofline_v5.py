@@ -3,11 +3,6 @@
 import csv, math, sys
 from pathlib import Path
 import numpy as np
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-
-# All text in Times New Roman
-mpl.rcParams['font.family'] = 'Times New Roman'
 
 # ---------- helpers ----------
 def read_summary(csv_path):
@@ -71,6 +66,14 @@ def annotate_app_point(ax, app_x, app_y, gy_func):
 
 # ---------- main plot ----------
 def plot_roofline(csv_path, title=None, savepath=None):
+    import matplotlib as mpl
+    if savepath:
+        mpl.use('Agg', force=False)   # file output only: skip GUI toolkit init
+    import matplotlib.pyplot as plt
+
+    # All text in Times New Roman
+    mpl.rcParams['font.family'] = 'Times New Roman'
+
     d = read_summary(csv_path)
 
     # App point
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+core.py – Instruction Roofline plots from a LIKWID roofline_summary.csv
+
+The plot_roofline*.py scripts are thin wrappers around plot_roofline(style=...):
+
+  'v6'         shaded regions, slope-aligned bandwidth labels,   plot_roofline.py
+               annotated app point
+  'v6-backup'  v6 as first released: Times New Roman,            backup/plot_roofline_v6.py
+               captioned middle region
+  'v3'         shaded regions with captions, inline roof labels  backup/plot_roofline_v3.py
+  'v2'         roofs clipped at the compute ceiling              backup/plot_roofline_v2.py
+  'basic'      slanted roofs + flat compute roof                 backup/plot_roofline.py
+
+plot_roofline_batch() renders many CSVs on one reused figure, from the shell:
+
+  python3 -m roofline.core a.csv b.csv c.csv -o outdir/
+
+matplotlib is only imported once a plot is actually drawn, so usage errors
+(and importing this module) stay cheap.
+"""
+import math, os, sys
+from functools import lru_cache, partial
+from pathlib import Path
+import numpy as np
+
+try:
+    from .roofline_io import read_summary
+except ImportError:          # run as a plain script / imported from roofline/
+    from roofline_io import read_summary
+
+# Label backgrounds (v6), shared by every annotation
+_BBOX_ROOF = {'facecolor': 'white', 'alpha': 0.35, 'edgecolor': 'none', 'pad': 0.8}
+_BBOX_PEAK = {'facecolor': 'white', 'alpha': 0.35, 'edgecolor': 'none', 'pad': 1.0}
+_BBOX_APP  = {'facecolor': 'white', 'alpha': 0.5,  'edgecolor': 'none', 'pad': 2.5}
+
+# ---------- helpers ----------
+def prefer_times_new_roman():
+    import matplotlib as mpl
+    mpl.rcParams['font.family'] = _serif_family()
+
+@lru_cache(maxsize=None)   # font lookup once per process; batch mode plots many figures
+def _serif_family():
+    from matplotlib import font_manager as fm
+
+    def available(family):
+        # exact lookup: no fallback, so no "findfont: Font family ... not found" warnings
+        try:
+            fm.findfont(fm.FontProperties(family=family), fallback_to_default=False)
+            return True
+        except ValueError:
+            return False
+
+    # 1) allow an override via env var if you have a .ttf (used whatever its family)
+    ttf = os.getenv("ROOFLINE_FONT_TTF")
+    if ttf and os.path.exists(ttf):
+        fm.fontManager.addfont(ttf)
+        return fm.FontProperties(fname=ttf).get_name()
+
+    # 2) try common system locations (Linux, macOS, Windows)
+    if not available('Times New Roman'):
+        candidates = [
+            "/usr/share/fonts/truetype/msttcorefonts/Times_New_Roman.ttf",
+            "/usr/share/fonts/truetype/msttcorefonts/times.ttf",
+            "/Library/Fonts/Times New Roman.ttf",
+            "C:/Windows/Fonts/times.ttf",
+            "C:/Windows/Fonts/Times New Roman.ttf",
+        ]
+        p = next((p for p in candidates if os.path.exists(p)), None)
+        if p:
+            fm.fontManager.addfont(p)
+
+    # 3) graceful fallbacks (usually present on Linux); resolved once here
+    #    instead of letting every text artist walk the family list
+    for family in ('Times New Roman', 'Nimbus Roman', 'Liberation Serif'):
+        if available(family):
+            return family
+    return 'DejaVu Serif'
+
+def roof_bandwidths(d, levels):
+    """(labels, MiB/s, Bytes/s) of the roof_<level> values in ``d`` that are set and > 0."""
+    mib = np.array([d.get(f'roof_{lvl}') or np.nan for lvl in levels])
+    keep = np.isfinite(mib) & (mib > 0)
+    mib = mib[keep]
+    return [lvl for lvl, k in zip(levels, keep) if k], mib, mib * (1 << 20)
+
+def roof_vertices(x_min, x_max, B, compute=None):
+    """Exact vertices of min(x*B, compute) over [x_min, x_max].
+
+    On log-log axes a bandwidth roof is a straight line, with a single kink
+    at the knee compute/B when a compute ceiling is given, so two or three
+    points describe it exactly.
+    """
+    if not compute or compute <= 0:
+        xs = np.array([x_min, x_max])
+        return xs, xs * B
+    xs = np.array([x_min, min(max(compute / B, x_min), x_max), x_max])
+    return xs, np.minimum(xs * B, compute)
+
+def save_tight(fig, savepath, dpi):
+    """savefig(bbox_inches='tight') with the bbox measured up front.
+
+    Like matplotlib's own 'tight', the bbox is measured with a renderer at
+    the output dpi (text extents depend on it) and padded by savefig's
+    default 0.1in pad_inches; savefig then reuses that same renderer.
+    """
+    screen_dpi = fig.dpi
+    fig.set_dpi(dpi)
+    try:
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+    finally:
+        fig.set_dpi(screen_dpi)
+    fig.savefig(savepath, dpi=dpi, bbox_inches=bbox)
+
+def new_figure(plt, figsize=None, fig=None):
+    """A blank, current figure of ``figsize``; ``fig`` is cleared and reused if given."""
+    if fig is None:
+        return plt.figure(figsize=figsize)
+    fig.clear()
+    fig.set_size_inches(figsize or plt.rcParams['figure.figsize'])
+    plt.figure(fig.number)   # make it current for the plt.* styles
+    return fig
+
+def line_angle_deg(ax, x0, y0, x1, y1):
+    """Angle of the segment (x0,y0)->(x1,y1) in display coords, for text rotation."""
+    (X0, Y0) = ax.transData.transform((x0, y0))
+    (X1, Y1) = ax.transData.transform((x1, y1))
+    return np.degrees(np.arctan2(Y1 - Y0, X1 - X0))
+
+def annotate_app_point(ax, app_x, app_y, gy_func):
+    """
+    Plot the application point (PostgreSQL tpcc) and annotate with (x,y) values.
+    If the point is very close to the x-axis, put label above; otherwise below.
+    """
+    x_val = app_x
+    y_val = gy_func(app_y)
+    # plot the grey dot
+    ax.scatter([x_val], [y_val], s=64, zorder=3,
+               label="PostgreSQL (tpcc)", color='#6b6b6b')
+
+    # decide label placement relative to x-axis
+    ymin, ymax = ax.get_ylim()
+    decades_above = math.log10(max(y_val, ymin*1.0000001) / ymin)
+
+    THRESH = 0.6  # ~0.6 decade (~4x above ymin)
+    if decades_above < THRESH:
+        offset = (0, 10)   # above
+        va = 'bottom'
+    else:
+        offset = (0, -12)  # below
+        va = 'top'
+
+    # value pair label
+    label_txt = f"({x_val:.3g} Instr/Byte, {y_val:.3g} GInstr/s)"
+    ax.annotate(
+        label_txt,
+        xy=(x_val, y_val),
+        xycoords='data',
+        textcoords='offset points',
+        xytext=offset,
+        ha='center', va=va,
+        fontsize=9, color='#4d4d4d',
+        bbox=_BBOX_APP,
+    )
+
+# ---------- styles ----------
+def _plot_basic(plt, d, title, savepath, fig=None):
+    # App point: Instr/s and Instr/Byte (x,y)
+    app_x = d.get('app_instr_per_byte')
+    app_instr_per_s = d.get('app_instr_per_sec')
+    if app_x is None or app_instr_per_s is None:
+        raise RuntimeError("Missing app point (app_instr_per_byte or app_instr_per_sec) in CSV")
+
+    # Roofs (bandwidth in MBytes/s)
+    labels, _, Bs = roof_bandwidths(d, ('L1', 'L2', 'L3', 'MEM'))
+
+    if not labels:
+        raise RuntimeError("No roofs found in CSV (roof_L1/roof_L2/roof_L3/roof_MEM)")
+
+    # Optional compute roof (Instruction/s estimate)
+    compute_instr_roof = d.get('roof_compute_instr_per_sec_est')
+
+    # X domain: cover app point and reasonable margin
+    # On an Instruction Roofline, performance = min_i (x * B_i) and optionally a compute roof (not drawn here).
+    # We just draw the four slanted roofs.
+    x_min = max(1e-6, app_x / 10.0)
+    x_max = app_x * 10.0
+
+    new_figure(plt, fig=fig)
+    for label, B in zip(labels, Bs):
+        plt.loglog(*roof_vertices(x_min, x_max, B), label=f"{label} roof")
+
+    # Optional flat compute roof (instr/s)
+    if compute_instr_roof is not None and compute_instr_roof > 0:
+        plt.loglog([x_min, x_max], [compute_instr_roof] * 2, linestyle='--', label="Compute roof (instr/s est)")
+
+    # Plot app point (axes are already log-scaled by the roofs); scatter uses the
+    # patch colour cycle, so take the next line colour as the old loglog marker did
+    plt.scatter([app_x], [app_instr_per_s], zorder=3, label="PostgreSQL (tpcc)",
+                color=f"C{len(plt.gca().lines) % 10}")
+
+    plt.xlabel("Operational intensity (Instructions / Byte)")
+    plt.ylabel("Performance (Instructions / second)")
+    plt.title(title or "Instruction Roofline (PostgreSQL + BenchBase)")
+    plt.legend()
+    plt.grid(True, which='both', ls=':')
+
+    if savepath:
+        save_tight(plt.gcf(), savepath, dpi=150)
+    else:
+        plt.show()
+
+def _plot_v2(plt, d, title, savepath, fig=None):
+    # App point
+    app_x = d.get('app_instr_per_byte')
+    app_y = d.get('app_instr_per_sec')
+    if app_x is None or app_y is None:
+        raise RuntimeError("Missing app point (app_instr_per_byte or app_instr_per_sec) in CSV")
+
+    # Bandwidth roofs (bytes/s)
+    labels, _, Bs = roof_bandwidths(d, ('L1', 'L2', 'L3', 'MEM'))
+
+    if not labels:
+        raise RuntimeError("No roofs in CSV (roof_L1/roof_L2/roof_L3/roof_MEM)")
+
+    # Optional compute ceiling
+    compute = d.get('roof_compute_instr_per_sec_est')
+    knees = compute / Bs if compute and compute > 0 else None
+
+    # X-range: cover app point and the knees (if any)
+    lo, hi = (app_x, app_x) if knees is None else (min(app_x, knees.min()), max(app_x, knees.max()))
+    x_min = max(1e-3, lo / 10.0)
+    x_max = hi * 10.0
+
+    new_figure(plt, (7.2, 5.4), fig)
+
+    # Draw clipped roofs (each slanted line capped at compute, if present)
+    for i in np.argsort(Bs, kind='stable'):  # sort by bandwidth
+        xs, ys = roof_vertices(x_min, x_max, Bs[i], compute)
+        plt.loglog(xs, ys, linewidth=2, label=f"{labels[i]} roof")
+
+    # Draw compute roof only from the first knee to the end
+    if knees is not None:
+        start = knees.min()
+        xs2 = [max(start, x_min), x_max]
+        if xs2[0] < x_max:
+            plt.loglog(xs2, [compute] * 2, linestyle='--', linewidth=2,
+                       label="Compute roof (instr/s est)")
+
+    # App point
+    plt.scatter([app_x], [app_y], s=64, zorder=3, label="PostgreSQL (tpcc)",
+                color=f"C{len(plt.gca().lines) % 10}")   # next line colour, as with loglog
+
+    plt.xlabel("Operational intensity (Instructions / Byte)")
+    plt.ylabel("Performance (Instructions / second)")
+    plt.title(title or "Instruction Roofline (PostgreSQL + BenchBase)")
+    plt.grid(True, which='both', ls=':')
+    plt.legend(loc='best')
+    if savepath:
+        save_tight(plt.gcf(), savepath, dpi=150)
+    else:
+        plt.show()
+
+def _plot_v3(plt, d, title, savepath, fig=None):
+    # App point
+    app_x = d.get('app_instr_per_byte')
+    app_y = d.get('app_instr_per_sec')
+    if app_x is None or app_y is None:
+        raise RuntimeError("Missing app point (app_instr_per_byte or app_instr_per_sec) in CSV")
+
+    # Bandwidth roofs (Bytes/s)
+    # We’ll draw in order: MEM, L3, L2, L1 (low->high bandwidth gives nicer layering)
+    order = ('MEM', 'L3', 'L2', 'L1')
+    color_map = {
+        'MEM':  '#1f77b4',  # blue
+        'L3':   '#ff7f0e',  # orange
+        'L2':   '#2ca02c',  # green
+        'L1':   '#d62728',  # red
+    }
+    labels, _, Bs = roof_bandwidths(d, order)
+
+    if not labels:
+        raise RuntimeError("No roofs in CSV (roof_L1/roof_L2/roof_L3/roof_MEM)")
+
+    colors = [color_map[lvl] for lvl in labels]
+
+    # Compute ceiling (instr/s)
+    compute = d.get('roof_compute_instr_per_sec_est')
+
+    # Knees (OI where each bandwidth line hits compute ceiling)
+    knees = compute / Bs if compute and compute > 0 else None
+
+    # X-range: cover app point and knees (if any)
+    lo, hi = (app_x, app_x) if knees is None else (min(app_x, knees.min()), max(app_x, knees.max()))
+    x_min = max(1e-3, lo / 10.0)
+    x_max = hi * 10.0
+
+    # Scale Y to GInstr/s for GFLOPS-like ticks
+    SCALE = 1e-9
+    def gy(y): return y * SCALE
+
+    fig = new_figure(plt, (8.4, 5.8), fig)
+    ax = fig.add_subplot()
+
+    # Shaded regions and captions (if compute present)
+    if knees is not None:
+        knee_left  = knees.min()   # L1 knee (highest BW)
+        knee_right = knees.max()   # MEM knee (lowest BW)
+        ax.axvspan(x_min, knee_left, facecolor='#d62728', alpha=0.06, lw=0)  # memory-ish
+        ax.axvspan(knee_left, knee_right, facecolor='#aaaaaa', alpha=0.06, lw=0)  # mixed
+        ax.axvspan(knee_right, x_max, facecolor='#1f77b4', alpha=0.06, lw=0)  # compute-ish
+
+        # Bottom-anchored text labels
+        trans = ax.get_xaxis_transform()  # y in axes coords
+        ax.text( (x_min*knee_left)**0.5, 0.03, "Memory bound?",
+                 transform=trans, ha='center', va='bottom', fontsize=10, color='#8c564b')
+        ax.text( (knee_left*knee_right)**0.5, 0.03, "Bound by compute\nand memory roofs?",
+                 transform=trans, ha='center', va='bottom', fontsize=10, color='#4d4d4d')
+        ax.text( (knee_right*x_max)**0.5, 0.03, "Compute bound?",
+                 transform=trans, ha='center', va='bottom', fontsize=10, color='#1f77b4')
+
+    # Draw each roof (clipped at compute)
+    for i, (label, B, color) in enumerate(zip(labels, Bs, colors)):
+        xs, ys = roof_vertices(x_min, x_max, B, compute)
+        knee = None if knees is None else knees[i]
+
+        ax.loglog(xs, ys * SCALE,
+                  linewidth=2.0, label=f"{label} roof", color=color)
+
+        # inline label on the sloped part
+        try:
+            # geometric midpoint of the sloped part (midpoint on a log axis)
+            x_text = math.sqrt(x_min * knee) if knee else math.sqrt(x_min * x_max)
+            y_text = gy(min(x_text * B, compute if compute else x_text * B))
+            ax.text(x_text, y_text*1.05, f"{label}",
+                    fontsize=9, color=color)
+        except Exception:
+            pass
+
+    # Compute roof line (flat, from first knee)
+    if knees is not None:
+        start = knees.min()
+        xs2 = [max(start, x_min), x_max]
+        if xs2[0] < x_max:
+            ax.loglog(xs2, [gy(compute)] * 2, linestyle='--', linewidth=2.2,
+                      label="Compute roof (instr/s est)", color='#9467bd')
+
+    # App point
+    ax.scatter([app_x], [gy(app_y)], s=64, zorder=3,
+               label="PostgreSQL (tpcc)", color='#6b6b6b')
+
+    # Axes labels & title (GFLOPS-like style)
+    ax.set_xlabel("Operational intensity (Instructions / Byte)")
+    ax.set_ylabel("Performance (Instructions / second)")  # GFLOPS-like labeling for Instructions
+    ax.set_title(title or "Instruction Roofline (PostgreSQL + BenchBase)")
+
+    # Finer grid
+    ax.set_axisbelow(True)
+    ax.grid(which='major', ls=':', lw=0.8, alpha=0.35)
+    ax.grid(which='minor', ls=':', lw=0.5, alpha=0.20)
+    ax.minorticks_on()
+
+    # Legend: outside + horizontal
+    handles, labels = ax.get_legend_handles_labels()
+    ax.legend(handles, labels, loc='lower center',
+              bbox_to_anchor=(0.5, 1.02), ncol=3, frameon=False)
+
+    # Layout with room for the legend above
+    plt.tight_layout(rect=(0, 0, 1, 0.92))
+
+    if savepath:
+        save_tight(fig, savepath, dpi=160)
+    else:
+        plt.show()
+
+def _plot_v6(plt, d, title, savepath, fig=None, mid_caption="", font=None):
+    if font:
+        plt.rcParams['font.family'] = font
+    else:
+        prefer_times_new_roman()
+
+    # App point
+    app_x = d.get('app_instr_per_byte')
+    app_y = d.get('app_instr_per_sec')
+    if app_x is None or app_y is None:
+        raise RuntimeError("Missing app point (app_instr_per_byte or app_instr_per_sec) in CSV")
+
+    # Bandwidth roofs (Bytes/s)
+    order = ('MEM', 'L3', 'L2', 'L1')  # low->high BW
+    color_map = {'MEM':'#1f77b4','L3':'#ff7f0e','L2':'#2ca02c','L1':'#d62728'}
+    labels, mbss, Bs = roof_bandwidths(d, order)  # mbss in MiB/s
+
+    if not labels:
+        raise RuntimeError("No roofs (roof_L1/roof_L2/roof_L3/roof_MEM) in CSV")
+
+    colors = [color_map[lvl] for lvl in labels]
+
+    # Compute ceilings
+    compute_instr = d.get('roof_compute_instr_per_sec_est')  # instr/s (from IPC*freq*cores)
+    # Optional FLOP ceilings (GFLOPS) – if you add these to CSV the label will switch automatically
+    sp_fma_gflops = d.get('roof_compute_sp_fma_gflops')
+    dp_fma_gflops = d.get('roof_compute_dp_fma_gflops')
+    scalar_add_gflops = d.get('roof_compute_scalar_add_gflops')
+
+    # Knees (where each BW roof hits the compute ceiling)
+    knees = compute_instr / Bs if compute_instr and compute_instr > 0 else None
+
+    # X range
+    lo, hi = (app_x, app_x) if knees is None else (min(app_x, knees.min()), max(app_x, knees.max()))
+    x_min = max(1e-3, lo / 10.0)
+    x_max = hi * 10.0
+
+    # Scale Y to GInstr/s (GFLOPS-like display for instruction roofline)
+    SCALE = 1e-9
+    def gy(y): return y * SCALE
+
+    fig = new_figure(plt, (8.8, 6.0), fig)
+    ax = fig.add_subplot()
+
+    # Shaded regions
+    if knees is not None:
+        knee_left  = knees.min()   # highest BW knee
+        knee_right = knees.max()   # lowest BW knee
+        ax.axvspan(x_min, knee_left,  facecolor='#d62728', alpha=0.06, lw=0)
+        ax.axvspan(knee_left, knee_right, facecolor='#aaaaaa', alpha=0.06, lw=0)
+        ax.axvspan(knee_right, x_max,  facecolor='#1f77b4', alpha=0.06, lw=0)
+        trans = ax.get_xaxis_transform()
+        ax.text((x_min*knee_left)**0.5,   0.03, "Memory bound", transform=trans,
+                ha='center', va='bottom', fontsize=10, color='#8c564b')
+        ax.text((knee_left*knee_right)**0.5, 0.03, mid_caption,
+                transform=trans, ha='center', va='bottom', fontsize=10, color='#4d4d4d')
+        ax.text((knee_right*x_max)**0.5,  0.03, "Compute bound", transform=trans,
+                ha='center', va='bottom', fontsize=10, color='#1f77b4')
+
+    # ---- stable rotation for memory labels (slope 1 on log-log axes) ----
+    def slope1_angle_deg(ax_):
+        dX, dY = np.diff(ax_.transData.transform([(1.0, 1.0), (10.0, 10.0)]), axis=0)[0]
+        return np.degrees(np.arctan2(dY, dX))
+    angle_slope1 = slope1_angle_deg(ax)
+
+    # Label anchors near the left end of each sloped segment, for all roofs at once.
+    # They stay in data coords: display coords move with tight_layout/savefig dpi.
+    x_starts = np.full(Bs.shape, x_min * 1.20)
+    if knees is not None:
+        x_starts = np.minimum(x_starts, knees * 0.55)
+    y_starts = x_starts * Bs
+    if knees is not None:
+        y_starts = np.minimum(y_starts, compute_instr)
+
+    # Draw roofs + place labels at the beginning of each sloped segment
+    for label, B, mbs, color, x_start, y_start in zip(labels, Bs, mbss, colors, x_starts, y_starts):
+        xs, ys = roof_vertices(x_min, x_max, B, compute_instr)
+        ax.loglog(xs, ys * SCALE, linewidth=2.0, label=f"{label} roof", color=color)
+
+        # --- Memory roofline label: start near left and align with slope-1 precisely ---
+        try:
+            gbps = (mbs / 1000.0)   # LIKWID MBytes/s → GB/s
+            txt  = f"{label} Bandwidth: {gbps:.2f} GB/s"
+
+            # Offset: put L3 label *below* the line, others above
+            if label == "L3":
+                offset = (2, -4)   # below line
+                va = 'top'
+            else:
+                offset = (2, 10)    # above line
+                va = 'center'
+
+            ax.annotate(
+                txt,
+                xy=(x_start, gy(y_start)),
+                xycoords='data',
+                textcoords='offset points',
+                xytext=offset,
+                rotation=angle_slope1-3,
+                rotation_mode='anchor',
+                ha='left', va=va,
+                color=color, fontsize=9,
+                bbox=_BBOX_ROOF,
+                clip_on=True
+            )
+        except Exception:
+            pass
+
+
+    # Compute roof (flat + label)
+    if knees is not None:
+        start = knees.min()
+        xs2 = [max(start, x_min), x_max]
+        if xs2[0] < x_max:
+            ax.loglog(xs2, [gy(compute_instr)] * 2,
+                      linestyle='--', linewidth=2.2,
+                      label="Compute roof (instr/s est)", color='#9467bd')
+
+            # --- Label for compute roof using available data ---
+            if sp_fma_gflops:
+                comp_label = f"SP Vector FMA Peak: {sp_fma_gflops:.2f} GFLOPS"
+            elif dp_fma_gflops:
+                comp_label = f"DP Vector FMA Peak: {dp_fma_gflops:.2f} GFLOPS"
+            elif scalar_add_gflops:
+                comp_label = f"Scalar Add Peak: {scalar_add_gflops:.2f} GFLOPS"
+            else:
+                comp_label = f"Instruction Peak (est.): {compute_instr*SCALE:.2f} GInstr/s"
+
+            xcl = start * 1.02
+            ax.text(xcl, gy(compute_instr)*1.02, comp_label,
+                    fontsize=10, color='#9467bd', ha='left', va='bottom',
+                    bbox=_BBOX_PEAK)
+
+    # App point with annotation
+    annotate_app_point(ax, app_x, app_y, gy)
+
+    # Axes & title
+    ax.set_xlabel("Operational intensity (Instr/Byte)")
+    ax.set_ylabel("Performance (GInstr/s)")
+    ax.set_title(title or "Instruction Roofline (PostgreSQL + BenchBase)", pad=14)
+
+    # Grid
+    ax.set_axisbelow(True)
+    ax.grid(which='major', ls=':', lw=0.8, alpha=0.35)
+    ax.grid(which='minor', ls=':', lw=0.5, alpha=0.20)
+    ax.minorticks_on()
+
+    # Legend outside & horizontal
+    handles, labels = ax.get_legend_handles_labels()
+    ax.legend(handles, labels, loc='lower center',
+              bbox_to_anchor=(0.5, 1.12), ncol=3, frameon=False)
+
+    plt.tight_layout(rect=(0, 0, 1, 0.84))
+    if savepath:
+        save_tight(fig, savepath, dpi=170)
+    else:
+        plt.show()
+
+_STYLES = {
+    'v6': _plot_v6,
+    'v6-backup': partial(_plot_v6, mid_caption="Bound by compute\nand memory roofs",
+                         font='Times New Roman'),
+    'v3': _plot_v3, 'v2': _plot_v2, 'basic': _plot_basic,
+}
+
+# ---------- main plot ----------
+def _renderer(style):
+    try:
+        return _STYLES[style]
+    except KeyError:
+        raise ValueError(f"Unknown style {style!r}; expected one of {sorted(_STYLES)}") from None
+
+def plot_roofline(csv_path, title=None, savepath=None, style='v6'):
+    """Draw the roofline for ``csv_path`` in ``style`` and save it (or show it)."""
+    render = _renderer(style)
+    d = read_summary(csv_path)
+    if savepath:
+        import matplotlib
+        matplotlib.use('Agg', force=False)   # file output only: skip GUI toolkit init
+    import matplotlib.pyplot as plt
+    with plt.rc_context():   # style font/rc changes end with the plot
+        render(plt, d, title, savepath)
+
+def plot_roofline_batch(csv_paths, outdir, style='v6'):
+    """Plot each CSV to ``outdir/<stem>.png`` on one reused figure.
+
+    LIKWID writes every run to <timestamp>/roofline_summary.csv, so when stems
+    collide the parent directory name is prepended (<timestamp>_roofline_summary.png),
+    and any name still taken gets a _2, _3, ... suffix.  A CSV that fails to
+    plot is reported and skipped.  Returns (written PNG paths, failed CSV paths).
+    """
+    render = _renderer(style)
+    paths = [Path(p) for p in csv_paths]
+    stems = [p.stem for p in paths]
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    import matplotlib
+    matplotlib.use('Agg', force=False)
+    import matplotlib.pyplot as plt
+    fig = plt.figure()
+    written, failed, used = [], [], set()
+    try:
+        for p in paths:
+            name = base = f"{p.parent.name}_{p.stem}" if stems.count(p.stem) > 1 else p.stem
+            n = 2
+            while name in used:
+                name, n = f"{base}_{n}", n + 1
+            used.add(name)
+            out = outdir / f"{name}.png"
+            try:
+                with plt.rc_context():
+                    render(plt, read_summary(p), None, str(out), fig=fig)
+            except Exception as e:
+                print(f"[ERROR] {p}: {e}", file=sys.stderr)
+                failed.append(p)
+                continue
+            written.append(out)
+    finally:
+        plt.close(fig)
+    return written, failed
+
+# ---------- CLI ----------
+def main(argv=None, style='v6', prog='plot_roofline.py'):
+    argv = sys.argv[1:] if argv is None else argv
+    if '-o' in argv:
+        # batch: CSV... -o OUTDIR
+        i = argv.index('-o')
+        outdir, csvs = argv[i+1:i+2], argv[:i] + argv[i+2:]
+        if outdir and csvs:
+            written, failed = plot_roofline_batch(csvs, outdir[0], style=style)
+            for out in written:
+                print(out)
+            if failed:
+                sys.exit(f"{len(failed)} of {len(csvs)} CSV(s) could not be plotted")
+            return
+    elif len(argv) >= 1:
+        csv_path = Path(argv[0])
+        out = Path(argv[1]) if len(argv) >= 2 else None
+        plot_roofline(str(csv_path), title=None, savepath=str(out) if out else None, style=style)
+        return
+    print(f"Usage: python3 {prog} /path/to/roofline_summary.csv [output.png]\n"
+          f"       python3 {prog} a.csv [b.csv ...] -o outdir/")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main(prog='-m roofline.core')
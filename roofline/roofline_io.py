@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Shared I/O helpers for the roofline plotting scripts."""
+import csv, os
+from functools import lru_cache
+
+@lru_cache(maxsize=32)
+def _read(path_str, mtime):
+    # mtime is part of the cache key only: a rewritten CSV is re-parsed
+    with open(path_str, newline='') as f:
+        rows = csv.reader(f)
+        header = next(rows)
+        ki, vi = header.index('metric'), header.index('value')
+        return {r[ki].strip(): (float(v) if (v := r[vi].strip()) else None)
+                for r in rows if r}
+
+def read_summary(csv_path):
+    """metric -> value (float, or None if blank) from a roofline_summary.csv.
+
+    Parsed once per (path, mtime); repeated calls, e.g. several plots of the
+    same input, reuse the cached result.
+    """
+    path_str = str(csv_path)
+    return dict(_read(path_str, os.path.getmtime(path_str)))